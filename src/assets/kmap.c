@@ -1,177 +1,97 @@
-#pragma GCC diagnostic push
-
-#pragma GCC diagnostic ignored "-Wconversion"
+// Copyright (C) 2021 Biren Patel. GNU General Public License v3.0.
+//
+// This file is generated by kmap.py from keywords.txt; do not edit it by hand.
 
+#include <limits.h>
+#include <stddef.h>
+#include <stdint.h>
 #include <string.h>
 
 #include "kmap.h"
 
-/* ANSI-C code produced by gperf version 3.1 */
-/* Command-line: gperf -t -C --null-strings --lookup-function-name=kmap_lookup keywords.txt  */
-/* Computed positions: -k'1-2' */
-
-#if !((' ' == 32) && ('!' == 33) && ('"' == 34) && ('#' == 35) \
-      && ('%' == 37) && ('&' == 38) && ('\'' == 39) && ('(' == 40) \
-      && (')' == 41) && ('*' == 42) && ('+' == 43) && (',' == 44) \
-      && ('-' == 45) && ('.' == 46) && ('/' == 47) && ('0' == 48) \
-      && ('1' == 49) && ('2' == 50) && ('3' == 51) && ('4' == 52) \
-      && ('5' == 53) && ('6' == 54) && ('7' == 55) && ('8' == 56) \
-      && ('9' == 57) && (':' == 58) && (';' == 59) && ('<' == 60) \
-      && ('=' == 61) && ('>' == 62) && ('?' == 63) && ('A' == 65) \
-      && ('B' == 66) && ('C' == 67) && ('D' == 68) && ('E' == 69) \
-      && ('F' == 70) && ('G' == 71) && ('H' == 72) && ('I' == 73) \
-      && ('J' == 74) && ('K' == 75) && ('L' == 76) && ('M' == 77) \
-      && ('N' == 78) && ('O' == 79) && ('P' == 80) && ('Q' == 81) \
-      && ('R' == 82) && ('S' == 83) && ('T' == 84) && ('U' == 85) \
-      && ('V' == 86) && ('W' == 87) && ('X' == 88) && ('Y' == 89) \
-      && ('Z' == 90) && ('[' == 91) && ('\\' == 92) && (']' == 93) \
-      && ('^' == 94) && ('_' == 95) && ('a' == 97) && ('b' == 98) \
-      && ('c' == 99) && ('d' == 100) && ('e' == 101) && ('f' == 102) \
-      && ('g' == 103) && ('h' == 104) && ('i' == 105) && ('j' == 106) \
-      && ('k' == 107) && ('l' == 108) && ('m' == 109) && ('n' == 110) \
-      && ('o' == 111) && ('p' == 112) && ('q' == 113) && ('r' == 114) \
-      && ('s' == 115) && ('t' == 116) && ('u' == 117) && ('v' == 118) \
-      && ('w' == 119) && ('x' == 120) && ('y' == 121) && ('z' == 122) \
-      && ('{' == 123) && ('|' == 124) && ('}' == 125) && ('~' == 126))
-/* The character set is not based on ISO-646.  */
-#error "gperf generated tables don't work with this execution character set. Please report a bug to <bug-gperf@gnu.org>."
-#endif
-
-#line 1 "keywords.txt"
-
-#include "kmap.h"
-#line 4 "keywords.txt"
-//kv_pair defined in kmap.h
-
-#define TOTAL_KEYWORDS 25
 #define MIN_WORD_LENGTH 2
 #define MAX_WORD_LENGTH 11
-#define MIN_HASH_VALUE 3
-#define MAX_HASH_VALUE 39
-/* maximum key range = 37, duplicates = 0 */
+#define HASH_SEED 0x191b8adfu
+#define HASH_SHIFT 26
+#define TABLE_SIZE 64
 
-#ifdef __GNUC__
-__inline
-#else
-#ifdef __cplusplus
-inline
-#endif
-#endif
-static unsigned int
-hash (register const char *str, register size_t len)
+static const unsigned char lengths[TABLE_SIZE] = {
+	[0] = 6,
+	[2] = 6,
+	[5] = 7,
+	[9] = 3,
+	[10] = 11,
+	[13] = 4,
+	[15] = 5,
+	[17] = 6,
+	[22] = 2,
+	[26] = 4,
+	[27] = 4,
+	[32] = 4,
+	[36] = 4,
+	[37] = 5,
+	[44] = 3,
+	[45] = 6,
+	[46] = 6,
+	[47] = 4,
+	[51] = 3,
+	[52] = 4,
+	[53] = 5,
+	[57] = 3,
+	[58] = 8,
+	[59] = 5,
+	[60] = 4
+};
+
+static const struct kv_pair wordlist[TABLE_SIZE] = {
+	[0] = {"struct", _STRUCT},
+	[2] = {"import", _IMPORT},
+	[5] = {"default", _DEFAULT},
+	[9] = {"pub", _PUB},
+	[10] = {"fallthrough", _FALLTHROUGH},
+	[13] = {"goto", _GOTO},
+	[15] = {"while", _WHILE},
+	[17] = {"return", _RETURN},
+	[22] = {"if", _IF},
+	[26] = {"true", _TRUE},
+	[27] = {"self", _SELF},
+	[32] = {"void", _VOID},
+	[36] = {"null", _NULL},
+	[37] = {"false", _FALSE},
+	[44] = {"let", _LET},
+	[45] = {"method", _METHOD},
+	[46] = {"switch", _SWITCH},
+	[47] = {"case", _CASE},
+	[51] = {"mut", _MUT},
+	[52] = {"func", _FUNC},
+	[53] = {"break", _BREAK},
+	[57] = {"for", _FOR},
+	[58] = {"continue", _CONTINUE},
+	[59] = {"label", _LABEL},
+	[60] = {"else", _ELSE}
+};
+
+static uint32_t kmap_hash(const char *str, size_t len)
 {
-  static const unsigned char asso_values[] =
-    {
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40,  0,  0, 20,
-       0,  0,  5, 30,  0, 20, 40, 40,  0,  0,
-      25,  5, 10, 40, 15,  5,  0,  5, 20, 20,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
-      40, 40, 40, 40, 40, 40
-    };
-  return len + asso_values[(unsigned char)str[1]] + asso_values[(unsigned char)str[0]];
+	const uint32_t first = (unsigned char) str[0];
+	const uint32_t last = (unsigned char) str[len - 1];
+	const uint32_t size = (uint32_t) len;
+	const uint32_t key = first | last << CHAR_BIT | size << (2 * CHAR_BIT);
+
+	return (key * HASH_SEED) >> HASH_SHIFT;
 }
 
-const struct kv_pair *
-kmap_lookup (register const char *str, register size_t len)
+const struct kv_pair *kmap_lookup(const char *str, size_t len)
 {
-  static const struct kv_pair wordlist[] =
-    {
-      {(char*)0}, {(char*)0}, {(char*)0},
-#line 18 "keywords.txt"
-      {"let", _LET},
-#line 11 "keywords.txt"
-      {"else", _ELSE,},
-#line 17 "keywords.txt"
-      {"label", _LABEL},
-#line 24 "keywords.txt"
-      {"method", _METHOD},
-#line 14 "keywords.txt"
-      {"default", _DEFAULT},
-#line 19 "keywords.txt"
-      {"mut", _MUT},
-#line 28 "keywords.txt"
-      {"self", _SELF},
-#line 30 "keywords.txt"
-      {"false", _FALSE},
-#line 20 "keywords.txt"
-      {"struct", _STRUCT},
-      {(char*)0},
-#line 6 "keywords.txt"
-      {"for", _FOR},
-#line 23 "keywords.txt"
-      {"func", _FUNC},
-      {(char*)0},
-#line 15 "keywords.txt"
-      {"fallthrough", _FALLTHROUGH},
-      {(char*)0},
-#line 22 "keywords.txt"
-      {"pub", _PUB},
-#line 29 "keywords.txt"
-      {"true", _TRUE},
-#line 8 "keywords.txt"
-      {"break", _BREAK,},
-#line 25 "keywords.txt"
-      {"return", _RETURN},
-      {(char*)0}, {(char*)0},
-#line 13 "keywords.txt"
-      {"case", _CASE},
-#line 7 "keywords.txt"
-      {"while", _WHILE,},
-#line 21 "keywords.txt"
-      {"import", _IMPORT},
-#line 10 "keywords.txt"
-      {"if", _IF},
-      {(char*)0},
-#line 27 "keywords.txt"
-      {"void", _VOID},
-      {(char*)0},
-#line 12 "keywords.txt"
-      {"switch", _SWITCH},
-      {(char*)0},
-#line 9 "keywords.txt"
-      {"continue", _CONTINUE,},
-#line 26 "keywords.txt"
-      {"null", _NULL},
-      {(char*)0}, {(char*)0}, {(char*)0}, {(char*)0},
-#line 16 "keywords.txt"
-      {"goto", _GOTO}
-    };
+	if (len < MIN_WORD_LENGTH || len > MAX_WORD_LENGTH) {
+		return NULL;
+	}
 
-  if (len <= MAX_WORD_LENGTH && len >= MIN_WORD_LENGTH)
-    {
-      register unsigned int key = hash (str, len);
+	const uint32_t slot = kmap_hash(str, len);
 
-      if (key <= MAX_HASH_VALUE)
-        {
-          register const char *s = wordlist[key].name;
+	if (lengths[slot] == len && !memcmp(str, wordlist[slot].name, len)) {
+		return &wordlist[slot];
+	}
 
-          if (s && !strncmp(str, s, len))
-            return &wordlist[key];
-        }
-    }
-  return 0;
+	return NULL;
 }
-
-
-#pragma GCC diagnostic pop
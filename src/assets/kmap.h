@@ -1,6 +1,6 @@
 // Copyright (C) 2021 Biren Patel. GNU General Public License v3.0.
 //
-// Encapsulation for the gperf auto-generated C code.
+// Encapsulation for the keyword lookup table generated by kmap.py.
 
 #pragma once
 
@@ -2,78 +2,176 @@
 
 # Copyright (C) 2021 Biren Patel. GNU General Public License v3.0.
 #
-# The C code generated by gperf has a few issues. It triggers the -Wconversion
-# error during compilation. It redelcares the struct defined in the kmap API.
-# It uses strcmp() which will not work with the scanner's pointer to the
-# in-memory source code. And, it doesn't include the string.h header file. This
-# script fixes all of these issues.
+# This script generates kmap.c, the keyword lookup table used by the scanner.
+# The keyword set is fixed at build time so the script searches for a seed that
+# makes a multiplicative hash over the first character, last character, and
+# length of each keyword collision-free. The generated kmap_lookup() is then a
+# single hash, one table load, and a memcmp() bounded by the word length, which
+# also works with the scanner's pointer to the in-memory source code.
+
+from os import replace
+from os.path import exists, getmtime
+from random import Random
 
-from subprocess import run
+# kmap.c only needs to be generated when the keywords or this script have
+# changed. The sidecar cache records their modification times.
+cache = ".keywords.cache"
+inputs = ("keywords.txt", __file__)
+
+# the hash key packs three bytes into 32 bits, and the seed search is seeded
+# with a constant so that the generated kmap.c is reproducible.
+key_bits = 32
+search_seed = 0
+search_attempts = 1000000
 
-# the code generated by gperf may be different depending on the version so we
-# check that gperf is at version 3.1.
-def check_gperf() -> None:
-    cmd = "gperf --version"
-    proc_status = run(cmd, check=True, shell=True, capture_output=True)
+template = """\
+// Copyright (C) 2021 Biren Patel. GNU General Public License v3.0.
+//
+// This file is generated by kmap.py from keywords.txt; do not edit it by hand.
 
-    version = proc_status.stdout.decode()
+#include <limits.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#include "kmap.h"
+
+#define MIN_WORD_LENGTH {min_len}
+#define MAX_WORD_LENGTH {max_len}
+#define HASH_SEED {seed:#010x}u
+#define HASH_SHIFT {shift}
+#define TABLE_SIZE {size}
+
+static const unsigned char lengths[TABLE_SIZE] = {{
+{lengths}
+}};
+
+static const struct kv_pair wordlist[TABLE_SIZE] = {{
+{wordlist}
+}};
+
+static uint32_t kmap_hash(const char *str, size_t len)
+{{
+	const uint32_t first = (unsigned char) str[0];
+	const uint32_t last = (unsigned char) str[len - 1];
+	const uint32_t size = (uint32_t) len;
+	const uint32_t key = first | last << CHAR_BIT | size << (2 * CHAR_BIT);
+
+	return (key * HASH_SEED) >> HASH_SHIFT;
+}}
+
+const struct kv_pair *kmap_lookup(const char *str, size_t len)
+{{
+	if (len < MIN_WORD_LENGTH || len > MAX_WORD_LENGTH) {{
+		return NULL;
+	}}
+
+	const uint32_t slot = kmap_hash(str, len);
+
+	if (lengths[slot] == len && !memcmp(str, wordlist[slot].name, len)) {{
+		return &wordlist[slot];
+	}}
+
+	return NULL;
+}}
+"""
+
+# each line of keywords.txt is a keyword and its token type separated by a comma
+def read_keywords() -> list:
+    keywords = []
+
+    with open("keywords.txt") as f:
+        for line in f:
+            fields = [field.strip() for field in line.split(",")]
+
+            if fields[0]:
+                keywords.append((fields[0], fields[1]))
+
+    return keywords
+
+# mirror of kmap_hash() in the generated C code
+def get_slot(word: str, seed: int, shift: int) -> int:
+    key = ord(word[0]) | ord(word[-1]) << 8 | len(word) << 16
+    product = (key * seed) & ((1 << key_bits) - 1)
+
+    return product >> shift
+
+# the table has at least twice as many slots as keywords, which keeps the
+# expected number of seeds tried before finding a perfect hash small.
+def find_seed(words: list, shift: int) -> int:
+    keys = {(word[0], word[-1], len(word)) for word in words}
+
+    if len(keys) != len(words):
+        raise ValueError("keywords must differ in first, last char, or length")
+
+    rng = Random(search_seed)
+
+    for _ in range(search_attempts):
+        seed = rng.getrandbits(key_bits) | 1
+        slots = {get_slot(word, seed, shift) for word in words}
+
+        if len(slots) == len(words):
+            return seed
+
+    raise ValueError("no perfect hash seed found for keywords.txt")
+
+def create_source(keywords: list) -> str:
+    words = [word for word, _ in keywords]
+    bits = (2 * len(words) - 1).bit_length()
+    shift = key_bits - bits
+    seed = find_seed(words, shift)
+
+    slots = sorted((get_slot(word, seed, shift), word, typ)
+                   for word, typ in keywords)
 
-    flag = version.find("3.1", 0, version.find('\n'))
+    lengths = ",\n".join(
+        "\t[{}] = {}".format(slot, len(word)) for slot, word, _ in slots
+    )
 
-    if flag == -1:
-        raise ValueError("gperf is not version 3.1")
+    wordlist = ",\n".join(
+        "\t[{}] = {{\"{}\", {}}}".format(slot, word, typ)
+        for slot, word, typ in slots
+    )
 
-# execute gperf on the shell and capture the generated C code from stdout.
-# stdout is captured as a python bytes object, hence the decode call.
-def exec_gperf() -> str:
-    options = "-t -C --null-strings"
-    hashname = "--lookup-function-name=kmap_lookup"
-    input = "keywords.txt"
-    cmd = "gperf {} {} {}".format(options, hashname, input)
+    return template.format(
+        min_len=min(map(len, words)),
+        max_len=max(map(len, words)),
+        seed=seed,
+        shift=shift,
+        size=1 << bits,
+        lengths=lengths,
+        wordlist=wordlist
+    )
+
+# the cache is fresh when it holds the current modification times of the inputs
+# and the generated kmap.c still exists.
+def is_cached(stamp: str) -> bool:
+    if not exists(cache) or not exists("kmap.c"):
+        return False
 
-    proc_status = run(cmd, check=True, shell=True, capture_output=True)
+    with open(cache) as f:
+        return f.read() == stamp
 
-    return proc_status.stdout.decode()
+# write to a temporary file and rename it over the destination so that an
+# interrupted run never leaves a truncated file behind.
+def write_atomic(path: str, text: str) -> None:
+    tmp = path + ".tmp"
 
-# include the strings.h header which is required by strncmp and the kmap.h
-# API that the ../scanner.c file requires.
-def add_include(text: str) -> str:
-    str_directive = "#include <string.h>"
-    api_directive = "#include \"kmap.h\""
-
-    return "\n\n".join([str_directive, api_directive, text])
-
-# add the pragma preprocessor directives to bypass the -Wconversion error.
-def add_diagnostic(text: str) -> str:
-    push = "#pragma GCC diagnostic push"
-    flag = "#pragma GCC diagnostic ignored \"-Wconversion\""
-    pop  = "#pragma GCC diagnostic pop"
-
-    return "\n\n".join([push, flag, text, pop])
-
-# remove struct kv_pair to avoid redefinition from kmap.h.
-def remove_struct(text: str) -> str:
-    struct = "struct kv_pair { char *name; token_type typ; };"
+    with open(tmp, "w") as f:
+        f.write(text)
 
-    return text.replace(struct, "//kv_pair defined in kmap.h")
+    replace(tmp, path)
 
-# exchange strcmp with strncmp and rewrite the logic on the if-branch
-def swap_cmp(text: str) -> str:
-    old_test = "if (s && *str == *s && !strcmp (str + 1, s + 1))"
-    new_test = "if (s && !strncmp(str, s, len))"
+def generate(stamp: str) -> None:
+    text = create_source(read_keywords())
 
-    return text.replace(old_test, new_test)
+    #replace whatever may be in an existing kmap.c file, we don't need
+    #the old contents.
+    write_atomic("kmap.c", text)
+    write_atomic(cache, stamp)
 
 if __name__ == "__main__":
-    check_gperf()
-    text = exec_gperf()
-
-    pipeline = (add_include, add_diagnostic, remove_struct, swap_cmp)
-
-    for func in pipeline:
-        text = func(text)
+    stamp = " ".join(str(getmtime(path)) for path in inputs)
 
-    #truncate whatever may be in an existing kmap.c file, we don't need
-    #the old contents.
-    with open("kmap.c", "w") as f:
-        f.write(text)
+    if not is_cached(stamp):
+        generate(stamp)
@@ -5,15 +5,19 @@
 
 import unittest
 
-from re import search
+from re import compile, MULTILINE
 from subprocess import run
+from sys import intern
+
+# captures the token type between the first two colons of a token dump line
+TOKEN_TYPE = compile(r"^TOKEN[^:]*:\s*([^:]+?)\s*:", MULTILINE)
 
 class TestTokenizer(unittest.TestCase):
     def test_all_tokenization_cases_from_file_input(self):
         #arrange
         self.maxDiff = None
 
-        cmd = "../debug/lemon --Dtokens ./test_scanner.lem"
+        cmd = ["../debug/lemon", "--Dtokens", "./test_scanner.lem"]
 
         expected = [
             "IDENTIFIER",
@@ -108,9 +112,14 @@ class TestTokenizer(unittest.TestCase):
             "LESS OR EQUAL", "EQUAL EQUAL", "EQUAL"
         ]
 
+        # isolate() interns its token types too, so equal types are the same
+        # object and assertListEqual can compare them by identity.
+        expected = [intern(name) for name in expected]
+
         #act
-        proc_output = run(cmd, check=True, shell=True, capture_output=True)
-        text = proc_output.stderr.decode()
+        proc_output = run(cmd, check=True, capture_output=True,
+                          encoding="latin-1")
+        text = proc_output.stderr
         types = self.isolate(text)
 
         #assert
@@ -118,21 +127,7 @@ class TestTokenizer(unittest.TestCase):
     
     def isolate(self, text: str):
         """return a list of token types in order of appearance"""
-        lines = text.split('\n')
-
-        tokens = [i for i in lines if i.find("TOKEN") != -1 ]
-
-        types = []
-
-        # fetch the region of text in the token which is between the two colons
-        # and then strip those colons along with any inner whitespace
-        for i in tokens:
-            match = search(r":[^:]+:", i)
-
-            if match:
-                types.append(match.group()[1:-1].strip())
-
-        return types
+        return [intern(match.group(1)) for match in TOKEN_TYPE.finditer(text)]
 
 
 if __name__ == "__main__":